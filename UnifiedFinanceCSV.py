@@ -1,7 +1,18 @@
+import hashlib
+import io
+import os
+import tempfile
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import seaborn as sns
 import matplotlib.pyplot as plt
+import plotly.express as px
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 # --- PAGE CONFIGURATION ---
 # Sets the title, icon, layout, and an initial message for the sidebar.
@@ -51,119 +62,279 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# --- MATPLOTLIB STYLE ---
+# Shared chart styling, applied once per process instead of per plot call.
+@st.cache_resource
+def _init_mpl():
+    """Applies the dashboard's matplotlib defaults once per process."""
+    plt.rcParams.update({
+        'axes.titlesize': 16,
+        'axes.titleweight': 'bold',
+        'axes.labelsize': 12,
+        'grid.linestyle': '--',
+        'grid.linewidth': 0.5,
+    })
+    return True
+
+_init_mpl()
+
+
 # --- DATA LOADING ---
 # Caching the data loading function for performance.
-@st.cache_data
-def load_data(uploaded_file):
-    """Loads data from the uploaded CSV file."""
+
+HEALTH_COL = 'Details.Health.Health Total Expenditure'
+EDU_COL = 'Details.Education.Education Total'
+
+# The dashboard only ever touches these columns; skipping the rest at parse
+# time cuts I/O and memory linearly with the columns dropped.
+USECOLS = ['State', 'Year', 'Totals.Revenue', 'Totals.Expenditure', HEALTH_COL, EDU_COL]
+
+def _optimize_dtypes(df):
+    """Downcasts the hot columns to cut memory bandwidth for masks, groupbys and melts.
+
+    Categorical State turns equality checks into int8 code compares instead of
+    string compares; narrower Year and float32 amounts halve the bytes scanned.
+    """
+    df['State'] = df['State'].astype('category')
+    df['Year'] = pd.to_numeric(df['Year'], downcast='integer')
+    for col in ['Totals.Revenue', 'Totals.Expenditure', HEALTH_COL, EDU_COL]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast='float')
+    return df
+
+def _file_digest(data):
+    """Hashes the upload bytes once with a fast non-cryptographic hash."""
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+@st.cache_data(max_entries=2, ttl=3600, show_spinner="Parsing CSV...")
+def load_data(file_key, _data):
+    """Loads data from the uploaded CSV bytes.
+
+    Cached on the precomputed file_key digest (the _data bytes are excluded
+    from hashing), so Streamlit never re-hashes the upload buffer on reruns.
+    Uses the multi-threaded pyarrow parser with arrow-backed dtypes so string
+    columns avoid Python object allocation. Falls back to the C engine with
+    explicit dtypes if pyarrow is unavailable. The parsed frame is persisted
+    as Parquet keyed on the same digest, so a restarted or evicted server
+    re-reads columnar Parquet instead of reparsing the CSV.
+    """
     try:
-        df = pd.read_csv(uploaded_file)
+        data = _data
+        cache_path = os.path.join(tempfile.gettempdir(), f"fin_{file_key}.parquet")
+        if os.path.exists(cache_path):
+            return pd.read_parquet(cache_path, engine='pyarrow')
+
+        header = pd.read_csv(io.BytesIO(data), nrows=0)
+        missing = [c for c in USECOLS if c not in header.columns]
+        if missing:
+            st.error(f"Error loading data: missing required columns: {', '.join(missing)}")
+            return None
+
+        try:
+            df = pd.read_csv(io.BytesIO(data), usecols=USECOLS,
+                             engine="pyarrow", dtype_backend="pyarrow")
+        except ImportError:
+            df = pd.read_csv(io.BytesIO(data), usecols=USECOLS, engine="c",
+                             dtype={'State': 'category', 'Year': 'int16'})
+        df = _optimize_dtypes(df)
+        # Sort once here so per-plot slices come out in Year order already.
+        df = df.sort_values(['State', 'Year']).reset_index(drop=True)
+
+        try:
+            df.to_parquet(cache_path)
+        except (ImportError, OSError):
+            pass  # the disk cache is best-effort; the in-memory cache still holds df
         return df
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
 
+# --- PRECOMPUTED FRAMES ---
+# The melt below is O(N) and independent of the user's selection, so it is
+# computed once per uploaded file instead of on every widget interaction.
+@st.cache_data(max_entries=2)
+def prepare_frames(df):
+    """Returns the long-format revenue/expenditure frame indexed by (State, Year)."""
+    melted = pd.melt(df,
+                     id_vars=['State', 'Year'],
+                     value_vars=['Totals.Revenue', 'Totals.Expenditure'],
+                     var_name='Metric',
+                     value_name='Amount')
+    # Metric has only two unique values, so map them once rather than
+    # allocating a stripped string per row.
+    melted['Metric'] = melted['Metric'].map({'Totals.Revenue': 'Revenue',
+                                             'Totals.Expenditure': 'Expenditure'}).astype('category')
+    melted = melted.set_index(['State', 'Year']).sort_index()
+    return melted
+
+@st.cache_data
+def get_filter_options(df):
+    """Returns the sorted state and year options for the sidebar widgets."""
+    if hasattr(df['State'], 'cat'):
+        states = sorted(df['State'].cat.categories.tolist())
+    else:
+        states = sorted(df['State'].unique().tolist())
+    return states, sorted(df['Year'].unique().tolist())
+
+@st.cache_data(max_entries=2)
+def get_group_indices(df):
+    """Returns positional row indices grouped by State.
+
+    Fetching rows with df.take(indices) is an O(1) dict lookup plus a gather,
+    versus the O(N) equality scan and mask allocation of df[df['State'] == state].
+    """
+    return {
+        'by_state': df.groupby('State', sort=False, observed=True).indices,
+    }
+
+@st.cache_data(max_entries=2)
+def _ranking_arrays(df):
+    """Extracts the contiguous arrays the ranking kernel runs over."""
+    return (df['State'].cat.codes.to_numpy(),
+            df['Totals.Revenue'].to_numpy(np.float64),
+            df['Year'].to_numpy(),
+            df['State'].cat.categories.to_numpy())
+
+@st.cache_data
+def state_revenues_for_year(df, year):
+    """Returns total revenue per state for one year, sorted descending.
+
+    States with no rows for the year are dropped, matching the old
+    groupby-sum behaviour.
+    """
+    codes, rev, yrs, categories = _ranking_arrays(df)
+    mask = yrs == year
+    sums = np.bincount(codes[mask], weights=rev[mask], minlength=len(categories))
+    present = np.bincount(codes[mask], minlength=len(categories)) > 0
+    return pd.Series(sums[present],
+                     index=pd.Index(categories[present], name='State')).sort_values(ascending=False)
+
 # --- PLOTTING FUNCTIONS ---
-# Each function corresponds to one of the original scripts.
+# Each function corresponds to one of the original scripts. The figure bodies
+# are cached as rendered PNG bytes keyed on the selection, so revisiting a
+# state/year the user already viewed skips the matplotlib draw entirely.
+
+def _reusable_figure(name, figsize, nrows=1, ncols=1):
+    """Fetches (or creates) a persistent Figure and clears it for redraw.
+
+    Reusing one Figure per plot kind skips matplotlib's artist/canvas
+    initialisation on every cache miss.
+    """
+    key = f'_fig_{name}'
+    if key not in st.session_state:
+        st.session_state[key] = plt.figure(figsize=figsize)
+    fig = st.session_state[key]
+    fig.clear()
+    return fig, fig.subplots(nrows, ncols)
+
+def _format_yticks(ax):
+    """Sets comma-formatted y tick labels up front, avoiding a Python callback per tick."""
+    ticks = ax.get_yticks()
+    ax.set_yticks(ticks)
+    ax.set_yticklabels([f"{int(t):,}" for t in ticks])
+
+def _fig_to_png(fig):
+    """Renders a figure to PNG bytes."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=100)
+    return buf.getvalue()
 
-def plot_revenue_vs_expenditure(df, state, year):
-    """Plots a bar chart comparing total revenue and expenditure for a selected state and year."""
-    df_melted = pd.melt(df,
-                        id_vars=['State', 'Year'],
-                        value_vars=['Totals.Revenue', 'Totals.Expenditure'],
-                        var_name='Metric',
-                        value_name='Amount')
-    df_melted['Metric'] = df_melted['Metric'].str.replace('Totals.', '', regex=False)
+@st.cache_data
+def fig_bytes_revenue_vs_exp(df, state, year):
+    """Renders the revenue vs. expenditure bar chart for a state and year as PNG bytes."""
+    filtered_data = prepare_frames(df).loc[[(state, year)]].reset_index()
 
-    filtered_data = df_melted[(df_melted['State'] == state) & (df_melted['Year'] == year)]
+    fig, ax = _reusable_figure('revexp', (8, 6))
+    ax.bar(filtered_data['Metric'].values, filtered_data['Amount'].values, color=['#4CAF50', '#F44336'])
 
-    if filtered_data.empty:
+    ax.set_title(f'Revenue vs. Expenditure for {state} in {year}')
+    ax.set_xlabel('Metric')
+    ax.set_ylabel('Amount (in USD)')
+    _format_yticks(ax)
+    fig.tight_layout()
+    return _fig_to_png(fig)
+
+def plot_revenue_vs_expenditure(df, state, year):
+    """Plots a bar chart comparing total revenue and expenditure for a selected state and year."""
+    if (state, year) not in prepare_frames(df).index:
         st.warning(f"No data available for {state} in {year}. Please select another combination.")
         return
 
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.barplot(x='Metric', y='Amount', data=filtered_data, ax=ax, palette=['#4CAF50', '#F44336'])
-    
-    ax.set_title(f'Revenue vs. Expenditure for {state} in {year}', fontsize=16, weight='bold')
-    ax.set_xlabel('Metric', fontsize=12)
-    ax.set_ylabel('Amount (in USD)', fontsize=12)
-    ax.get_yaxis().set_major_formatter(plt.FuncFormatter(lambda x, p: format(int(x), ',')))
-    plt.tight_layout()
-    st.pyplot(fig)
+    st.image(fig_bytes_revenue_vs_exp(df, state, year))
+
+@st.cache_data
+def trends_arrays(df, state):
+    """Returns the Year, health and education expenditure arrays for one state.
+
+    Handing matplotlib plain ndarrays avoids its per-draw pandas unwrapping
+    and dtype re-checks.
+    """
+    state_data = df.take(get_group_indices(df)['by_state'][state])
+    return (state_data['Year'].to_numpy(),
+            state_data[HEALTH_COL].to_numpy(),
+            state_data[EDU_COL].to_numpy())
+
+@st.cache_data
+def fig_bytes_expenditure_trends(df, state):
+    """Renders the health and education trend charts for a state as one PNG."""
+    years, health, education = trends_arrays(df, state)
+
+    fig, axes = _reusable_figure('trends', (20, 6), ncols=2)
+    for ax, values, label, color in ((axes[0], health, 'Health', 'dodgerblue'),
+                                     (axes[1], education, 'Education', 'orange')):
+        ax.plot(years, values, marker='o', linewidth=2.5, color=color)
+        ax.set_title(f'{label} Expenditure Trend for {state}')
+        ax.set_xlabel('Year')
+        ax.set_ylabel(f'Total {label} Expenditure (USD)')
+        ax.grid(True, which='both')
+        _format_yticks(ax)
+        ax.tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+    return _fig_to_png(fig)
 
 def plot_expenditure_trends(df, state):
     """Plots line charts for health and education expenditure trends for a selected state."""
-    health_col = 'Details.Health.Health Total Expenditure'
-    edu_col = 'Details.Education.Education Total'
-
     # Check if required columns exist
-    if health_col not in df.columns or edu_col not in df.columns:
+    if HEALTH_COL not in df.columns or EDU_COL not in df.columns:
         st.error("Error: Required expenditure columns not found in the dataset.")
         return
 
-    state_data = df[df['State'] == state].sort_values('Year')
-
-    if state_data.empty:
+    if state not in get_group_indices(df)['by_state']:
         st.warning(f"No data available for the state: {state}.")
         return
 
-    col1, col2 = st.columns(2)
-
-    with col1:
-        fig1, ax1 = plt.subplots(figsize=(10, 6))
-        sns.lineplot(x='Year', y=health_col, data=state_data, marker='o', linewidth=2.5, ax=ax1, color='dodgerblue')
-        ax1.set_title(f'Health Expenditure Trend for {state}', fontsize=16, weight='bold')
-        ax1.set_xlabel('Year', fontsize=12)
-        ax1.set_ylabel('Total Health Expenditure (USD)', fontsize=12)
-        ax1.grid(True, which='both', linestyle='--', linewidth=0.5)
-        ax1.get_yaxis().set_major_formatter(plt.FuncFormatter(lambda x, p: format(int(x), ',')))
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        st.pyplot(fig1)
-
-    with col2:
-        fig2, ax2 = plt.subplots(figsize=(10, 6))
-        sns.lineplot(x='Year', y=edu_col, data=state_data, marker='o', linewidth=2.5, ax=ax2, color='orange')
-        ax2.set_title(f'Education Expenditure Trend for {state}', fontsize=16, weight='bold')
-        ax2.set_xlabel('Year', fontsize=12)
-        ax2.set_ylabel('Total Education Expenditure (USD)', fontsize=12)
-        ax2.grid(True, which='both', linestyle='--', linewidth=0.5)
-        ax2.get_yaxis().set_major_formatter(plt.FuncFormatter(lambda x, p: format(int(x), ',')))
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        st.pyplot(fig2)
-
-def plot_revenue_rankings(df, year):
-    """Plots bar charts for the top 10 and bottom 10 states by revenue for a selected year."""
-    df_year = df[df['Year'] == year]
-
-    if df_year.empty:
-        st.warning(f"No data available for the year: {year}.")
-        return
+    st.image(fig_bytes_expenditure_trends(df, state))
 
-    state_revenues = df_year.groupby('State')['Totals.Revenue'].sum().sort_values(ascending=False)
+@st.cache_data
+def ranking_figures(df, year):
+    """Builds the interactive top/bottom 10 revenue bar charts for a year."""
+    state_revenues = state_revenues_for_year(df, year)
     top_10_states = state_revenues.head(10)
     bottom_10_states = state_revenues.tail(10).sort_values(ascending=True)
 
-    fig, axes = plt.subplots(2, 1, figsize=(12, 18))
-    fig.suptitle(f'State Revenue Rankings for {year}', fontsize=20, weight='bold', y=1.02)
-    
-    # Top 10 Plot
-    sns.barplot(x=top_10_states.values, y=top_10_states.index, ax=axes[0], palette='viridis')
-    axes[0].set_title('Top 10 States by Revenue Collection', fontsize=16)
-    axes[0].set_xlabel('Total Revenue (in USD)', fontsize=12)
-    axes[0].set_ylabel('State', fontsize=12)
-    axes[0].ticklabel_format(style='plain', axis='x')
+    figures = []
+    for title, ranked, scale in (
+            ('Top 10 States by Revenue Collection', top_10_states, 'Viridis'),
+            ('Bottom 10 States by Revenue Collection', bottom_10_states, 'Plasma_r')):
+        data = ranked.rename('Totals.Revenue').reset_index()
+        fig = px.bar(data, x='Totals.Revenue', y='State', orientation='h',
+                     color='Totals.Revenue', color_continuous_scale=scale, title=title)
+        fig.update_layout(yaxis=dict(autorange='reversed'), coloraxis_showscale=False,
+                          xaxis_title='Total Revenue (in USD)')
+        figures.append(fig)
+    return figures
 
-    # Bottom 10 Plot
-    sns.barplot(x=bottom_10_states.values, y=bottom_10_states.index, ax=axes[1], palette='plasma_r')
-    axes[1].set_title('Bottom 10 States by Revenue Collection', fontsize=16)
-    axes[1].set_xlabel('Total Revenue (in USD)', fontsize=12)
-    axes[1].set_ylabel('State', fontsize=12)
-    axes[1].ticklabel_format(style='plain', axis='x')
+def plot_revenue_rankings(df, year):
+    """Plots bar charts for the top 10 and bottom 10 states by revenue for a selected year."""
+    if year not in get_filter_options(df)[1]:
+        st.warning(f"No data available for the year: {year}.")
+        return
 
-    plt.tight_layout(rect=[0, 0, 1, 0.98])
-    st.pyplot(fig)
+    top_fig, bottom_fig = ranking_figures(df, year)
+    st.plotly_chart(top_fig, use_container_width=True)
+    st.plotly_chart(bottom_fig, use_container_width=True)
 
 
 # --- MAIN APPLICATION ---
@@ -178,17 +349,32 @@ with st.sidebar:
     uploaded_file = st.file_uploader("Upload your finance CSV file", type=["csv"])
 
     if uploaded_file is not None:
-        df = load_data(uploaded_file)
+        file_bytes = uploaded_file.getvalue()
+        df = load_data(_file_digest(file_bytes), file_bytes)
         if df is not None:
             st.success("File loaded successfully!")
             
             # Get unique values for filters
-            states = sorted(df['State'].unique())
-            years = sorted(df['Year'].unique())
+            states, years = get_filter_options(df)
             
             # Create interactive widgets
             selected_state = st.selectbox("Select a State", states)
             selected_year = st.select_slider("Select a Year", options=years, value=years[-1]) # Default to the latest year
+
+            # Surfaces per-function cache memory so slow or bloated cached
+            # functions are visible instead of silently eating RAM.
+            with st.expander("Cache stats"):
+                try:
+                    from streamlit.runtime.caching import get_data_cache_stats_provider
+                    stats = get_data_cache_stats_provider().get_stats()
+                    # Newer Streamlit groups stats into a dict of lists keyed by
+                    # function; older versions return a flat list.
+                    if isinstance(stats, dict):
+                        stats = [stat for group in stats.values() for stat in group]
+                    st.write([{'function': stat.cache_name, 'bytes': stat.byte_length}
+                              for stat in stats])
+                except Exception:
+                    st.caption("Cache statistics are unavailable in this Streamlit version.")
     else:
         st.info("Awaiting for a CSV file to be uploaded.")
         st.stop()